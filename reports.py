@@ -0,0 +1,42 @@
+# Gemini report generation, run as an RQ job (`rq worker reports`).
+# Kept apart from app.py so the worker's per-job process imports only what a
+# report needs, and never runs app.py's gevent monkey-patching.
+import os
+import redis
+import google.generativeai as genai
+
+# --- Configuration ---
+# Load the Gemini API key from environment variables for security
+GEMINI_MODEL = None
+try:
+    GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
+    if not GEMINI_API_KEY:
+        print("Warning: GEMINI_API_KEY environment variable not set.")
+    # REST (plain HTTP) rather than gRPC: gRPC channels aren't fork-safe, and RQ forks a process per job
+    genai.configure(api_key=GEMINI_API_KEY, transport='rest')
+    # Build the model client once and share it across jobs
+    if GEMINI_API_KEY:
+        GEMINI_MODEL = genai.GenerativeModel('gemini-1.5-flash-latest')
+except Exception as e:
+    print(f"Error configuring Gemini API: {e}")
+
+# Upper bound on a single Gemini call, so a stalled call can't tie up a report worker indefinitely
+GEMINI_TIMEOUT_SECONDS = float(os.environ.get('GEMINI_TIMEOUT_SECONDS', 30))
+
+# Use Heroku's REDIS_URL if available, otherwise a local Redis.
+REDIS_URL = os.environ.get('REDIS_URL', "redis://localhost:6379/0")
+redis_client = redis.from_url(REDIS_URL)
+
+REPORT_CACHE_TTL_SECONDS = 86400
+
+
+def generate_report_text(cache_key, prompt):
+    """RQ job: run the Gemini call and cache the report for the next request."""
+    try:
+        response = GEMINI_MODEL.generate_content(prompt, request_options={'timeout': GEMINI_TIMEOUT_SECONDS})
+        report_text = response.text
+    except Exception as e:
+        print(f"Gemini API Error: {e}")
+        raise
+    redis_client.setex(cache_key, REPORT_CACHE_TTL_SECONDS, report_text)
+    return report_text
@@ -1,4 +1,5 @@
 -- Drop tables in reverse order of dependency to avoid foreign key constraints
+DROP MATERIALIZED VIEW IF EXISTS attendance_summary_30d;
 DROP TABLE IF EXISTS attendance;
 DROP TABLE IF EXISTS students;
 DROP TABLE IF EXISTS teachers;
@@ -46,3 +47,36 @@ CREATE TABLE attendance (
   FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE,
   FOREIGN KEY (class_id) REFERENCES classes(id) ON DELETE CASCADE
 );
+
+-- Per-student rollup of the last 30 days, used to build the Gemini report prompt.
+-- Refresh it hourly with a Heroku Scheduler job running
+-- `flask --app app refresh-attendance-summary`.
+CREATE MATERIALIZED VIEW attendance_summary_30d AS
+WITH recent AS (
+  SELECT student_id, date::date AS day, status,
+         -- Constant across each run of consecutive records with the same status
+         ROW_NUMBER() OVER (PARTITION BY student_id ORDER BY date::date)
+           - ROW_NUMBER() OVER (PARTITION BY student_id, status ORDER BY date::date) AS run
+  FROM attendance
+  WHERE date::date > CURRENT_DATE - 30
+),
+absence_runs AS (
+  SELECT student_id, COUNT(*) AS length
+  FROM recent
+  WHERE status = 'Absent'
+  GROUP BY student_id, run
+)
+SELECT r.student_id,
+       COUNT(*) AS total_days,
+       COUNT(*) FILTER (WHERE r.status = 'Full Day') AS full_days,
+       COUNT(*) FILTER (WHERE r.status = 'Half Day') AS half_days,
+       COUNT(*) FILTER (WHERE r.status = 'Absent') AS absences,
+       COALESCE((SELECT MAX(ar.length) FROM absence_runs ar WHERE ar.student_id = r.student_id), 0)
+         AS longest_absence_streak,
+       MIN(r.day) AS first_day,
+       MAX(r.day) AS last_day
+FROM recent r
+GROUP BY r.student_id;
+
+-- Required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE UNIQUE INDEX idx_attendance_summary_30d_student ON attendance_summary_30d (student_id);